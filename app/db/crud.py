@@ -1,223 +1,255 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+import asyncio
+import time
 import asyncpg
-from .session import get_db_connection, close_db_connection
-from ..schemas.task import TaskCreate, TaskUpdate, Task
+from .session import get_db_connection
+from ..core.config import settings
+from ..schemas.task import TaskCreate, TaskUpdate, Task, TaskRow
+
+# Queries are module-level constants so asyncpg's per-connection statement
+# cache sees the exact same string on every call and skips the Parse step.
+# Task.from_row / TaskRow.from_row read columns positionally, so keep this order in every SELECT.
+_TASK_COLUMNS = "id, name, description, status_id, flag_id"
+
+_CREATE_SQL = f"""
+    INSERT INTO tasks (name, description, status_id, flag_id)
+    VALUES ($1, $2, $3, $4)
+    RETURNING {_TASK_COLUMNS}
+"""
+
+_CREATE_BATCH_SQL = f"""
+    INSERT INTO tasks (name, description, status_id, flag_id)
+    SELECT * FROM UNNEST($1::text[], $2::text[], $3::int[], $4::int[])
+    RETURNING {_TASK_COLUMNS}
+"""
+
+_GET_ALL_SQL = f"""
+    SELECT {_TASK_COLUMNS}
+    FROM tasks
+    ORDER BY id
+    LIMIT $1 OFFSET $2
+"""
+
+_GET_BY_ID_SQL = f"""
+    SELECT {_TASK_COLUMNS}
+    FROM tasks
+    WHERE id = $1
+"""
+
+_GET_BY_STATUS_SQL = f"""
+    SELECT {_TASK_COLUMNS}
+    FROM tasks
+    WHERE status_id = $1
+    ORDER BY id
+    LIMIT $2
+"""
+
+_SEARCH_SQL = f"""
+    SELECT {_TASK_COLUMNS}
+    FROM tasks
+    WHERE name ILIKE $1 OR description ILIKE $1
+    ORDER BY
+        CASE
+            WHEN name ILIKE $1 THEN 1
+            WHEN description ILIKE $1 THEN 2
+            ELSE 3
+        END,
+        id
+    LIMIT $2
+"""
+
+_DELETE_SQL = "DELETE FROM tasks WHERE id = $1 RETURNING id"
+
+_DELETE_BATCH_SQL = "DELETE FROM tasks WHERE id = ANY($1::int[]) RETURNING id"
+
+_STATS_SQL = """
+    SELECT
+        COUNT(*) as total_tasks,
+        COUNT(*) FILTER (WHERE status_id = 1) as pending_tasks,
+        COUNT(*) FILTER (WHERE status_id = 2) as in_progress_tasks,
+        COUNT(*) FILTER (WHERE status_id = 3) as completed_tasks,
+        COUNT(*) FILTER (WHERE description IS NOT NULL) as tasks_with_description
+    FROM tasks
+"""
+
+# Fields left as None in TaskUpdate bind NULL and COALESCE keeps the stored
+# value, so a single statement covers every partial update in one round-trip.
+_UPDATE_SQL = f"""
+    UPDATE tasks
+    SET name = COALESCE($2, name),
+        description = COALESCE($3, description),
+        status_id = COALESCE($4, status_id),
+        flag_id = COALESCE($5, flag_id)
+    WHERE id = $1
+    RETURNING {_TASK_COLUMNS}
+"""
+
+# Stats are polled by dashboards, so concurrent callers share one table scan
+# per STATS_CACHE_TTL window. Writes through TaskCRUD drop the cached value
+# at once; writes from other workers or clients arrive as a NOTIFY on
+# TASKS_CHANGED_CHANNEL (sent by a trigger on the tasks table).
+TASKS_CHANGED_CHANNEL = "tasks_changed"
+
+_STATS_CACHE_TTL = settings.STATS_CACHE_TTL
+_stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_stats_generation = 0
+_stats_lock = asyncio.Lock()
+
+def invalidate_stats_cache() -> None:
+    """Drop cached statistics so the next get_stats call hits the database"""
+    global _stats_cache, _stats_generation
+    _stats_cache = None
+    _stats_generation += 1
+
+def on_tasks_changed(connection, pid, channel, payload) -> None:
+    """asyncpg NOTIFY callback for TASKS_CHANGED_CHANNEL"""
+    invalidate_stats_cache()
 
 class TaskCRUD:
     @staticmethod
     async def create(task: TaskCreate) -> Task:
         """Create a new task with optimized query"""
-        conn = await get_db_connection()
-        try:
-            query = """
-                INSERT INTO tasks (name, description, status_id, flag_id)
-                VALUES ($1, $2, $3, $4)
-                RETURNING id, name, description, status_id, flag_id
-            """
-            row = await conn.fetchrow(
-                query, 
-                task.name, 
-                task.description, 
-                task.status_id, 
-                task.flag_id
-            )
-            return Task(**dict(row))
-        except asyncpg.UniqueViolationError:
-            raise ValueError("Task with this name already exists")
-        except asyncpg.ForeignKeyViolationError:
-            raise ValueError("Invalid status_id or flag_id")
-        finally:
-            await close_db_connection(conn)
+        async with get_db_connection() as conn:
+            try:
+                row = await conn.fetchrow(
+                    _CREATE_SQL,
+                    task.name,
+                    task.description,
+                    task.status_id,
+                    task.flag_id
+                )
+            except asyncpg.UniqueViolationError:
+                raise ValueError("Task with this name already exists")
+            except asyncpg.ForeignKeyViolationError:
+                raise ValueError("Invalid status_id or flag_id")
+            invalidate_stats_cache()
+            return Task.from_row(row)
 
     @staticmethod
-    async def create_batch(tasks: List[TaskCreate]) -> List[Task]:
-        """Create multiple tasks in a single transaction"""
+    async def create_batch(tasks: List[TaskCreate]) -> List[TaskRow]:
+        """Create multiple tasks with one multi-row INSERT ... RETURNING"""
         if not tasks:
             return []
-            
-        conn = await get_db_connection()
-        try:
-            async with conn.transaction():
-                query = """
-                    INSERT INTO tasks (name, description, status_id, flag_id)
-                    VALUES ($1, $2, $3, $4)
-                    RETURNING id, name, description, status_id, flag_id
-                """
-                rows = await conn.executemany(query, [
-                    (task.name, task.description, task.status_id, task.flag_id)
-                    for task in tasks
-                ])
-                return [Task(**dict(row)) for row in rows]
-        finally:
-            await close_db_connection(conn)
+
+        # Bind one typed array per column (SoA) so asyncpg encodes each
+        # column in a single pass and the server unnests them into rows
+        names = [task.name for task in tasks]
+        descriptions = [task.description for task in tasks]
+        status_ids = [task.status_id for task in tasks]
+        flag_ids = [task.flag_id for task in tasks]
+        async with get_db_connection() as conn:
+            try:
+                rows = await conn.fetch(
+                    _CREATE_BATCH_SQL,
+                    names,
+                    descriptions,
+                    status_ids,
+                    flag_ids
+                )
+            except asyncpg.UniqueViolationError:
+                raise ValueError("Task with this name already exists")
+            except asyncpg.ForeignKeyViolationError:
+                raise ValueError("Invalid status_id or flag_id")
+        invalidate_stats_cache()
+        return [TaskRow.from_row(row) for row in rows]
 
     @staticmethod
-    async def get_all(limit: int = 100, offset: int = 0) -> List[Task]:
+    async def get_all(limit: int = 100, offset: int = 0) -> List[TaskRow]:
         """Get all tasks with pagination"""
-        conn = await get_db_connection()
-        try:
-            query = """
-                SELECT id, name, description, status_id, flag_id
-                FROM tasks 
-                ORDER BY id
-                LIMIT $1 OFFSET $2
-            """
-            rows = await conn.fetch(query, limit, offset)
-            return [Task(**dict(row)) for row in rows]
-        finally:
-            await close_db_connection(conn)
+        async with get_db_connection() as conn:
+            rows = await conn.fetch(_GET_ALL_SQL, limit, offset)
+            return [TaskRow.from_row(row) for row in rows]
 
     @staticmethod
     async def get_by_id(task_id: int) -> Optional[Task]:
         """Get task by ID with optimized query"""
-        conn = await get_db_connection()
-        try:
-            query = """
-                SELECT id, name, description, status_id, flag_id
-                FROM tasks 
-                WHERE id = $1
-            """
-            row = await conn.fetchrow(query, task_id)
-            return Task(**dict(row)) if row else None
-        finally:
-            await close_db_connection(conn)
+        async with get_db_connection() as conn:
+            row = await conn.fetchrow(_GET_BY_ID_SQL, task_id)
+            return Task.from_row(row) if row else None
 
     @staticmethod
-    async def get_by_status(status_id: int, limit: int = 50) -> List[Task]:
+    async def get_by_status(status_id: int, limit: int = 50) -> List[TaskRow]:
         """Get tasks by status with pagination"""
-        conn = await get_db_connection()
-        try:
-            query = """
-                SELECT id, name, description, status_id, flag_id
-                FROM tasks 
-                WHERE status_id = $1
-                ORDER BY id
-                LIMIT $2
-            """
-            rows = await conn.fetch(query, status_id, limit)
-            return [Task(**dict(row)) for row in rows]
-        finally:
-            await close_db_connection(conn)
+        async with get_db_connection() as conn:
+            rows = await conn.fetch(_GET_BY_STATUS_SQL, status_id, limit)
+            return [TaskRow.from_row(row) for row in rows]
 
     @staticmethod
-    async def search_tasks(search_term: str, limit: int = 50) -> List[Task]:
+    async def search_tasks(search_term: str, limit: int = 50) -> List[TaskRow]:
         """Search tasks by name or description"""
-        conn = await get_db_connection()
-        try:
-            query = """
-                SELECT id, name, description, status_id, flag_id
-                FROM tasks 
-                WHERE name ILIKE $1 OR description ILIKE $1
-                ORDER BY 
-                    CASE 
-                        WHEN name ILIKE $1 THEN 1
-                        WHEN description ILIKE $1 THEN 2
-                        ELSE 3
-                    END,
-                    id
-                LIMIT $2
-            """
+        async with get_db_connection() as conn:
             search_pattern = f"%{search_term}%"
-            rows = await conn.fetch(query, search_pattern, limit)
-            return [Task(**dict(row)) for row in rows]
-        finally:
-            await close_db_connection(conn)
+            rows = await conn.fetch(_SEARCH_SQL, search_pattern, limit)
+            return [TaskRow.from_row(row) for row in rows]
 
     @staticmethod
     async def update(task_id: int, task_update: TaskUpdate) -> Optional[Task]:
-        """Update task by ID with optimized query building"""
-        conn = await get_db_connection()
-        try:
-            # Check if task exists first
-            existing = await conn.fetchrow(
-                "SELECT id FROM tasks WHERE id = $1", 
-                task_id
-            )
-            if not existing:
+        """Update task by ID in a single UPDATE ... RETURNING round-trip"""
+        values = (
+            task_update.name,
+            task_update.description,
+            task_update.status_id,
+            task_update.flag_id
+        )
+        async with get_db_connection() as conn:
+            if all(value is None for value in values):
+                # Nothing to change: read the row rather than run a no-op UPDATE,
+                # which would still write a new row version and fire tasks_changed
+                row = await conn.fetchrow(_GET_BY_ID_SQL, task_id)
+                return Task.from_row(row) if row else None
+
+            try:
+                # RETURNING no row means the task does not exist
+                row = await conn.fetchrow(_UPDATE_SQL, task_id, *values)
+            except asyncpg.ForeignKeyViolationError:
+                raise ValueError("Invalid status_id or flag_id")
+            if not row:
                 return None
-            
-            # Build dynamic update query efficiently
-            update_data = {}
-            if task_update.name is not None:
-                update_data['name'] = task_update.name
-            if task_update.description is not None:
-                update_data['description'] = task_update.description
-            if task_update.status_id is not None:
-                update_data['status_id'] = task_update.status_id
-            if task_update.flag_id is not None:
-                update_data['flag_id'] = task_update.flag_id
-            
-            if not update_data:
-                # Return existing task if no updates
-                existing_task = await conn.fetchrow(
-                    "SELECT * FROM tasks WHERE id = $1", 
-                    task_id
-                )
-                return Task(**dict(existing_task))
-            
-            # Build query dynamically
-            set_clause = ", ".join(f"{k} = ${i+2}" for i, k in enumerate(update_data.keys()))
-            values = list(update_data.values()) + [task_id]
-            
-            query = f"""
-                UPDATE tasks 
-                SET {set_clause}
-                WHERE id = ${len(values)}
-                RETURNING id, name, description, status_id, flag_id
-            """
-            
-            row = await conn.fetchrow(query, *values)
-            return Task(**dict(row))
-        except asyncpg.ForeignKeyViolationError:
-            raise ValueError("Invalid status_id or flag_id")
-        finally:
-            await close_db_connection(conn)
+            invalidate_stats_cache()
+            return Task.from_row(row)
 
     @staticmethod
     async def delete(task_id: int) -> bool:
         """Delete task by ID"""
-        conn = await get_db_connection()
-        try:
-            result = await conn.execute(
-                "DELETE FROM tasks WHERE id = $1", 
-                task_id
-            )
-            return result == "DELETE 1"
-        finally:
-            await close_db_connection(conn)
+        async with get_db_connection() as conn:
+            row = await conn.fetchrow(_DELETE_SQL, task_id)
+        if row is None:
+            return False
+        invalidate_stats_cache()
+        return True
 
     @staticmethod
     async def delete_batch(task_ids: List[int]) -> int:
         """Delete multiple tasks by IDs"""
         if not task_ids:
             return 0
-            
-        conn = await get_db_connection()
-        try:
+
+        async with get_db_connection() as conn:
             # Use ANY operator for efficient batch deletion
-            query = "DELETE FROM tasks WHERE id = ANY($1)"
-            result = await conn.execute(query, task_ids)
-            # Extract the number of deleted rows
-            deleted_count = int(result.split()[-1])
-            return deleted_count
-        finally:
-            await close_db_connection(conn)
+            rows = await conn.fetch(_DELETE_BATCH_SQL, task_ids)
+        if rows:
+            invalidate_stats_cache()
+        return len(rows)
 
     @staticmethod
     async def get_stats() -> Dict[str, Any]:
-        """Get task statistics"""
-        conn = await get_db_connection()
-        try:
-            query = """
-                SELECT 
-                    COUNT(*) as total_tasks,
-                    COUNT(CASE WHEN status_id = 1 THEN 1 END) as pending_tasks,
-                    COUNT(CASE WHEN status_id = 2 THEN 1 END) as in_progress_tasks,
-                    COUNT(CASE WHEN status_id = 3 THEN 1 END) as completed_tasks,
-                    COUNT(CASE WHEN description IS NOT NULL THEN 1 END) as tasks_with_description
-                FROM tasks
-            """
-            row = await conn.fetchrow(query)
-            return dict(row)
-        finally:
-            await close_db_connection(conn)
+        """Get task statistics, cached for STATS_CACHE_TTL seconds"""
+        global _stats_cache
+        cached = _stats_cache
+        if cached and time.monotonic() - cached[0] < _STATS_CACHE_TTL:
+            return cached[1]
+
+        async with _stats_lock:
+            # Another caller may have refreshed the cache while we waited
+            cached = _stats_cache
+            if cached and time.monotonic() - cached[0] < _STATS_CACHE_TTL:
+                return cached[1]
+
+            generation = _stats_generation
+            async with get_db_connection() as conn:
+                row = await conn.fetchrow(_STATS_SQL)
+            stats = dict(row)
+            # Don't cache a result that a concurrent write has already made stale
+            if generation == _stats_generation:
+                _stats_cache = (time.monotonic(), stats)
+            return stats
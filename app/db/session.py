@@ -1,10 +1,31 @@
+import asyncio
 import asyncpg
-from typing import Optional
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 from ..core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Global connection pool
 _pool: Optional[asyncpg.Pool] = None
 
+# Dedicated LISTEN connection, kept outside the pool so it never occupies a slot.
+# Subscriptions are remembered so they can be restored after a reconnect.
+_listener: Optional[asyncpg.Connection] = None
+_listen_callbacks: Dict[str, Callable[..., Any]] = {}
+_reconnect_task: Optional[asyncio.Task] = None
+_LISTENER_MAX_BACKOFF = 30.0
+
+# Acquires that found the pool saturated; reported by get_pool_status and
+# logged at most once per interval so an overloaded service isn't also
+# flooding its logs
+_saturation_events = 0
+_saturation_logged_at = 0.0
+_saturation_logged_count = 0
+_SATURATION_LOG_INTERVAL = 60.0
+
 async def get_pool() -> asyncpg.Pool:
     """Get or create the database connection pool"""
     global _pool
@@ -13,24 +34,101 @@ async def get_pool() -> asyncpg.Pool:
             settings.DATABASE_URL,
             min_size=settings.DB_POOL_MIN_SIZE,
             max_size=settings.DB_POOL_MAX_SIZE,
-            command_timeout=settings.DB_COMMAND_TIMEOUT
+            max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+            max_queries=settings.DB_POOL_MAX_QUERIES,
+            command_timeout=settings.DB_COMMAND_TIMEOUT,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE
         )
     return _pool
 
-async def get_db_connection():
-    """Get database connection from pool"""
+def _record_saturation(pool: asyncpg.Pool):
+    """Count a saturated acquire and log a rate-limited summary"""
+    global _saturation_events, _saturation_logged_at, _saturation_logged_count
+    _saturation_events += 1
+    now = time.monotonic()
+    if now - _saturation_logged_at >= _SATURATION_LOG_INTERVAL:
+        logger.warning(
+            "Database pool saturated (%d connections in use, %d waits since last report)",
+            pool.get_size(), _saturation_events - _saturation_logged_count
+        )
+        _saturation_logged_at = now
+        _saturation_logged_count = _saturation_events
+
+@asynccontextmanager
+async def get_db_connection() -> AsyncIterator[asyncpg.Connection]:
+    """Acquire a connection from the pool, released even on cancellation"""
     pool = await get_pool()
-    return await pool.acquire()
+    if pool.get_idle_size() == 0 and pool.get_size() >= pool.get_max_size():
+        _record_saturation(pool)
+    async with pool.acquire() as conn:
+        yield conn
 
-async def close_db_connection(conn):
-    """Return connection to pool"""
-    if conn:
-        pool = await get_pool()
-        await pool.release(conn)
+async def _connect_listener():
+    """Open the LISTEN connection and subscribe every registered channel"""
+    global _listener
+    conn = await asyncpg.connect(settings.DATABASE_URL)
+    try:
+        for channel, callback in _listen_callbacks.items():
+            await conn.add_listener(channel, callback)
+    except Exception:
+        await conn.close()
+        raise
+    _listener = conn
+    conn.add_termination_listener(_on_listener_terminated)
+
+def _on_listener_terminated(conn: asyncpg.Connection):
+    """Schedule a reconnect when the LISTEN connection drops unexpectedly"""
+    global _listener, _reconnect_task
+    if conn is not _listener:
+        # Closed by close_pool, or an older connection already replaced
+        return
+    logger.warning("Database LISTEN connection lost, reconnecting")
+    _listener = None
+    if _reconnect_task is None or _reconnect_task.done():
+        _reconnect_task = asyncio.get_running_loop().create_task(_reconnect_listener())
+
+async def _reconnect_listener():
+    """Re-establish the LISTEN connection with exponential backoff"""
+    delay = 1.0
+    while _listener is None and _listen_callbacks:
+        try:
+            await _connect_listener()
+        except Exception as e:
+            logger.warning(f"LISTEN reconnect failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _LISTENER_MAX_BACKOFF)
+            continue
+        logger.info("Database LISTEN connection re-established")
+        # Notifications sent while disconnected are lost, so fire each
+        # callback once to let subscribers drop anything they cached
+        for channel, callback in _listen_callbacks.items():
+            callback(_listener, 0, channel, "")
+
+async def start_listener(channel: str, callback: Callable[..., Any]):
+    """Subscribe callback(connection, pid, channel, payload) to a NOTIFY channel"""
+    global _reconnect_task
+    _listen_callbacks[channel] = callback
+    if _listener is not None:
+        await _listener.add_listener(channel, callback)
+    elif _reconnect_task is None or _reconnect_task.done():
+        try:
+            await _connect_listener()
+        except Exception as e:
+            # Listeners only invalidate caches, which expire on their own, so
+            # a failed connect must not stop startup; keep retrying instead
+            logger.warning(f"Database LISTEN connection failed, retrying in background: {e}")
+            _reconnect_task = asyncio.get_running_loop().create_task(_reconnect_listener())
 
 async def close_pool():
-    """Close the connection pool"""
-    global _pool
+    """Close the LISTEN connection and the connection pool"""
+    global _pool, _listener, _reconnect_task
+    _listen_callbacks.clear()
+    if _reconnect_task:
+        _reconnect_task.cancel()
+        _reconnect_task = None
+    if _listener:
+        listener, _listener = _listener, None
+        await listener.close()
     if _pool:
         await _pool.close()
         _pool = None
@@ -40,8 +138,17 @@ async def get_pool_status():
     if _pool:
         return {
             "pool_size": _pool.get_size(),
+            "idle_size": _pool.get_idle_size(),
             "min_size": settings.DB_POOL_MIN_SIZE,
             "max_size": settings.DB_POOL_MAX_SIZE,
+            "saturation_events": _saturation_events,
             "status": "active"
         }
-    return {"pool_size": 0, "min_size": 0, "max_size": 0, "status": "inactive"}
+    return {
+        "pool_size": 0,
+        "idle_size": 0,
+        "min_size": 0,
+        "max_size": 0,
+        "saturation_events": _saturation_events,
+        "status": "inactive"
+    }
@@ -1,56 +1,135 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from contextlib import asynccontextmanager
 import time
 import logging
+import asyncpg
+import orjson
 from .api.routes_tasks import router
-from .db.session import get_db_connection, close_pool, close_db_connection
+from .db.session import get_db_connection, close_pool, get_pool_status, start_listener
+from .db.crud import TASKS_CHANGED_CHANNEL, on_tasks_changed
 from .core.config import settings
 
+# Settings used by logging, middleware and request handlers, bound once at import
+DEBUG = settings.DEBUG
+API_V1_STR = settings.API_V1_STR
+PROJECT_NAME = settings.PROJECT_NAME
+VERSION = settings.VERSION
+CORS_ORIGINS = tuple(settings.BACKEND_CORS_ORIGINS)
+
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO if not settings.DEBUG else logging.DEBUG,
+    level=logging.INFO if not DEBUG else logging.DEBUG,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Every worker runs the startup DDL at boot. Each script is sent as one
+# multi-statement string, which PostgreSQL runs as a single transaction, and
+# starts by taking this transaction-scoped advisory lock so concurrent workers
+# apply DDL one at a time instead of racing on the catalogs.
+_DDL_LOCK_ID = 0x7461736B  # "task"
+
+def _serialized(ddl: str) -> str:
+    """Prefix a DDL script with the startup advisory lock"""
+    return f"SELECT pg_advisory_xact_lock({_DDL_LOCK_ID});\n{ddl}"
+
+_TABLE_DDL = _serialized("""
+    CREATE TABLE IF NOT EXISTS tasks (
+        id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        description TEXT,
+        status_id INTEGER DEFAULT 1 CHECK (status_id IN (1, 2, 3)),
+        flag_id INTEGER DEFAULT 1 CHECK (flag_id IN (1, 2)),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+""")
+
+# Best-effort DDL, run after the table exists
+_OPTIONAL_DDL = (
+    (
+        "Database indexes",
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_status_id ON tasks(status_id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_flag_id ON tasks(flag_id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
+        """,
+    ),
+    (
+        # Trigram indexes let the ILIKE '%term%' search use an index scan
+        "Search indexes",
+        """
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS idx_tasks_name_trgm ON tasks USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_tasks_description_trgm ON tasks USING gin (description gin_trgm_ops);
+        """,
+    ),
+    (
+        # Statement-level trigger so every writer invalidates cached stats.
+        # Created only when missing: DROP/CREATE on every boot would take an
+        # ACCESS EXCLUSIVE lock on tasks and block reads during restarts.
+        "Change notification trigger",
+        f"""
+        DO $$
+        BEGIN
+            IF to_regprocedure('notify_tasks_changed()') IS NULL THEN
+                CREATE FUNCTION notify_tasks_changed() RETURNS trigger AS $fn$
+                BEGIN
+                    PERFORM pg_notify('{TASKS_CHANGED_CHANNEL}', '');
+                    RETURN NULL;
+                END;
+                $fn$ LANGUAGE plpgsql;
+            END IF;
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'tasks_changed' AND tgrelid = 'tasks'::regclass
+            ) THEN
+                CREATE TRIGGER tasks_changed
+                    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tasks
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_tasks_changed();
+            END IF;
+        END
+        $$;
+        """,
+    ),
+)
+
+async def _run_optional_ddl(conn: asyncpg.Connection, label: str, ddl: str):
+    """Run one best-effort DDL script, logging failures"""
+    try:
+        await conn.execute(_serialized(ddl))
+        logger.info(f"{label} created successfully")
+    except Exception as index_error:
+        # Older tables may lack indexed columns, or pg_trgm/plpgsql may be unavailable
+        logger.warning(f"{label} could not be created: {index_error}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     logger.info("Starting Task API application...")
     try:
-        # Test database connection and create tables
-        conn = await get_db_connection()
-        
-        # Create the tasks table with all required columns
-        await conn.execute("""
-          CREATE TABLE IF NOT EXISTS tasks (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL UNIQUE,
-                description TEXT,
-                status_id INTEGER DEFAULT 1 CHECK (status_id IN (1, 2, 3)),
-                flag_id INTEGER DEFAULT 1 CHECK (flag_id IN (1, 2)),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Check if columns exist before creating indexes
-        try:
-            # Create indexes for better performance (only if columns exist)
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_tasks_status_id ON tasks(status_id);
-                CREATE INDEX IF NOT EXISTS idx_tasks_flag_id ON tasks(flag_id);
-                CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
-            """)
-            logger.info("Database indexes created successfully")
-        except Exception as index_error:
-            logger.warning(f"Some indexes could not be created: {index_error}")
-        
-        await close_db_connection(conn)
+        # Test database connection and create tables; creating the pool
+        # already opens DB_POOL_MIN_SIZE connections, so it is warm from here on
+        async with get_db_connection() as conn:
+            # Create the tasks table with all required columns
+            await conn.execute(_TABLE_DDL)
+
+            # The advisory lock serializes the scripts anyway, so run them in
+            # turn on this connection; each is its own transaction, so one
+            # failing doesn't affect the others
+            for label, ddl in _OPTIONAL_DDL:
+                await _run_optional_ddl(conn, label, ddl)
+
+        # Drop cached stats whenever any process writes to the tasks table;
+        # if LISTEN can't connect yet it retries in the background
+        await start_listener(TASKS_CHANGED_CHANNEL, on_tasks_changed)
+
         logger.info("Database connection established and tables created")
         
     except Exception as e:
@@ -66,18 +145,18 @@ async def lifespan(app: FastAPI):
 
 # Create FastAPI app with lifespan
 app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
+    title=PROJECT_NAME,
+    version=VERSION,
     description="A high-performance FastAPI-based REST API for task management with full CRUD operations",
-    docs_url="/docs" if settings.DEBUG else None,
-    redoc_url="/redoc" if settings.DEBUG else None,
+    docs_url="/docs" if DEBUG else None,
+    redoc_url="/redoc" if DEBUG else None,
     lifespan=lifespan
 )
 
 # Add middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -85,11 +164,30 @@ app.add_middleware(
 
 app.add_middleware(
     TrustedHostMiddleware,
-    allowed_hosts=["*"] if settings.DEBUG else ["localhost", "127.0.0.1"]
+    allowed_hosts=["*"] if DEBUG else ["localhost", "127.0.0.1"]
 )
 
 # Include routes
-app.include_router(router, prefix=settings.API_V1_STR)
+app.include_router(router, prefix=API_V1_STR)
+
+# Domain errors raised by TaskCRUD (duplicate name, invalid ids)
+@app.exception_handler(ValueError)
+async def value_error_handler(request: Request, exc: ValueError):
+    """Translate validation errors from the data layer into 400 responses"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+# Database errors not mapped by TaskCRUD
+@app.exception_handler(asyncpg.PostgresError)
+async def database_exception_handler(request: Request, exc: asyncpg.PostgresError):
+    """Log database errors and return a generic 500 response"""
+    logger.error(f"Database error: {exc}", exc_info=True)
+    return JSONResponse(
+        status_code=500,
+        content={
+            "detail": "Database error",
+            "type": "database_error"
+        }
+    )
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -104,35 +202,58 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
+# Request timing middleware (pure ASGI, avoids BaseHTTPMiddleware overhead)
+class TimingMiddleware:
     """Add processing time header to responses"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
 
-# Health check endpoint
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start_time = time.perf_counter_ns()
+
+        async def send_with_process_time(message: Message):
+            if message["type"] == "http.response.start":
+                process_time = (time.perf_counter_ns() - start_time) / 1e9
+                # ASGI lets apps omit "headers" from http.response.start
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message).append("X-Process-Time", str(process_time))
+            await send(message)
+
+        await self.app(scope, receive, send_with_process_time)
+
+app.add_middleware(TimingMiddleware)
+
+# Health check endpoint; probed constantly by load balancers, so the body
+# is serialized once at import time
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": PROJECT_NAME,
+    "version": VERSION
+})
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": settings.PROJECT_NAME,
-        "version": settings.VERSION,
-        "timestamp": time.time()
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
+
+# Pool status endpoint
+@app.get("/admin/pool")
+async def pool_status():
+    """Database connection pool status"""
+    return await get_pool_status()
 
 # Root endpoint
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
     return {
-        "message": f"Welcome to {settings.PROJECT_NAME}",
-        "version": settings.VERSION,
-        "docs": "/docs" if settings.DEBUG else "Documentation disabled in production",
+        "message": f"Welcome to {PROJECT_NAME}",
+        "version": VERSION,
+        "docs": "/docs" if DEBUG else "Documentation disabled in production",
         "health": "/health"
     }
 
@@ -141,8 +262,8 @@ async def root():
 async def api_info():
     """API information endpoint"""
     return {
-        "name": settings.PROJECT_NAME,
-        "version": settings.VERSION,
+        "name": PROJECT_NAME,
+        "version": VERSION,
         "description": "High-performance task management API",
         "features": [
             "Full CRUD operations",
@@ -154,9 +275,9 @@ async def api_info():
             "Performance optimized"
         ],
         "endpoints": {
-            "tasks": f"{settings.API_V1_STR}/tasks/",
-            "batch_operations": f"{settings.API_V1_STR}/tasks/batch",
-            "statistics": f"{settings.API_V1_STR}/tasks/stats/summary",
+            "tasks": f"{API_V1_STR}/tasks/",
+            "batch_operations": f"{API_V1_STR}/tasks/batch",
+            "statistics": f"{API_V1_STR}/tasks/stats/summary",
             "health": "/health"
         }
     }
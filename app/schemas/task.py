@@ -1,5 +1,6 @@
+from dataclasses import dataclass
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional, Sequence
 
 class TaskBase(BaseModel):
     name: str
@@ -21,3 +22,32 @@ class Task(TaskBase):
     
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Task":
+        """Build a Task from a trusted DB row (id, name, description, status_id, flag_id), skipping validation"""
+        return cls.model_construct(
+            id=row[0],
+            name=row[1],
+            description=row[2],
+            status_id=row[3],
+            flag_id=row[4]
+        )
+
+@dataclass
+class TaskRow:
+    """Slotted task record for list endpoints; orjson serializes it natively"""
+    # Declared by hand since dataclass(slots=True) needs Python 3.10; this
+    # works because no field has a default
+    __slots__ = ("id", "name", "description", "status_id", "flag_id")
+
+    id: int
+    name: str
+    description: Optional[str]
+    status_id: int
+    flag_id: int
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "TaskRow":
+        """Build a TaskRow from a DB row (id, name, description, status_id, flag_id)"""
+        return cls(row[0], row[1], row[2], row[3], row[4])
@@ -1,5 +1,23 @@
+import os
 import uvicorn
-from app.main import app
+from app.core.config import settings
+
+try:
+    import uvloop  # noqa: F401
+    LOOP = "uvloop"
+except ImportError:  # uvloop is not available on Windows
+    LOOP = "asyncio"
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers size their DB pools from WEB_CONCURRENCY, so pass the real count on
+    os.environ["WEB_CONCURRENCY"] = str(settings.WORKERS)
+    # Multiple workers need the app as an import string so each process loads it
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WORKERS,
+        loop=LOOP,
+        http="httptools",
+        access_log=False
+    )
@@ -12,11 +12,11 @@ def test_imports():
         print(f"   Version: {settings.VERSION}")
         
         # Test database session
-        from app.db.session import get_db_connection, close_db_connection
+        from app.db.session import get_db_connection, close_pool
         print("✅ Database session imported successfully")
         
         # Test schemas
-        from app.schemas.task import Task, TaskCreate, TaskUpdate
+        from app.schemas.task import Task, TaskCreate, TaskUpdate, TaskRow
         print("✅ Schemas imported successfully")
         
         # Test CRUD operations